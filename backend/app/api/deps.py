@@ -1,16 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db, read_from_primary_if_stale
 from app.core.security import decode_access_token
 from app.models.user import User, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+def _authenticate(db: Session, token: str) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -25,21 +22,49 @@ def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = read_from_primary_if_stale(
+        db, lambda session: session.query(User).filter(User.email == email).first()
+    )
     if user is None:
         raise credentials_exception
     
     return user
 
-def get_current_teacher(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    if current_user.role != UserRole.TEACHER:
+def _require_teacher(user: User) -> User:
+    if user.role != UserRole.TEACHER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized. Teacher access required."
         )
-    return current_user
+    return user
+
+# Write routes use the primary session (get_db) and read-only routes the
+# read session (get_read_db). The user is resolved from the same session
+# the route uses, so each request holds a single pooled connection.
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    return _authenticate(db, token)
+
+def get_current_reader(
+    db: Session = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """Current user for read-only routes."""
+    return _authenticate(db, token)
+
+def get_current_teacher(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    return _require_teacher(current_user)
+
+def get_current_teacher_reader(
+    current_user: User = Depends(get_current_reader)
+) -> User:
+    """Current teacher for read-only routes."""
+    return _require_teacher(current_user)
 
 def get_current_student(
     current_user: User = Depends(get_current_user)
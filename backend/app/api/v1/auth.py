@@ -6,6 +6,7 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.core.security import verify_password, get_password_hash, create_access_token
+from app.api.deps import get_current_reader
 from app.config import settings
 
 router = APIRouter()
@@ -63,5 +64,5 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: User = Depends(get_current_reader)):
     return current_user
\ No newline at end of file
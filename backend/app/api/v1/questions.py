@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional, Union
+from app.database import get_db, get_read_db, read_from_primary_if_stale
 from app.models.user import User
-from app.models.question import Question
-from app.schemas.question import QuestionCreate, QuestionResponse, QuestionListResponse
-from app.api.deps import get_current_teacher, get_current_user
+from app.models.question import Question, DifficultyLevel
+from app.models.submission_signature import SubmissionSignature
+from app.schemas.question import (
+    QuestionCreate, QuestionResponse, QuestionListResponse, StudentQuestionResponse
+)
+from app.api.deps import get_current_teacher, get_current_reader
+from app.services.similarity import similarity_index
+from app.services.question_search import question_search, SearchFilters
+from app.services.question_cache import question_cache, question_view, serialize_question
 
 router = APIRouter()
 
@@ -32,6 +38,7 @@ def create_question(
     db.add(db_question)
     db.commit()
     db.refresh(db_question)
+    question_search.index(db_question)
     
     return db_question
 
@@ -39,25 +46,64 @@ def create_question(
 def get_questions(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     questions = db.query(Question).offset(skip).limit(limit).all()
     return questions
 
-@router.get("/{question_id}", response_model=QuestionResponse)
+@router.get("/search", response_model=List[QuestionListResponse])
+def search_questions(
+    q: str = "",
+    difficulty: Optional[DifficultyLevel] = None,
+    min_points: Optional[int] = None,
+    max_points: Optional[int] = None,
+    teacher_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
+):
+    filters = SearchFilters(
+        difficulty=difficulty,
+        min_points=min_points,
+        max_points=max_points,
+        teacher_id=teacher_id
+    )
+    return question_search.search(db, q, filters, skip, limit)
+
+@router.get("/{question_id}", response_model=Union[QuestionResponse, StudentQuestionResponse])
 def get_question(
     question_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
-    question = db.query(Question).filter(Question.id == question_id).first()
-    if not question:
+    # Only the version is read up front; the full row (with its test cases)
+    # is loaded and serialized on a cache miss.
+    version = read_from_primary_if_stale(
+        db, lambda session: session.query(Question.version).filter(Question.id == question_id).scalar()
+    )
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found"
         )
-    return question
+    
+    view = question_view(current_user)
+    body = question_cache.get(question_id, version, view)
+    if body is None:
+        question = read_from_primary_if_stale(
+            db, lambda session: session.query(Question).filter(Question.id == question_id).first()
+        )
+        if not question:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found"
+            )
+        body = serialize_question(question, view)
+        question_cache.set(question_id, question.version, view, body)
+    
+    return Response(content=body, media_type="application/json")
 
 @router.put("/{question_id}", response_model=QuestionResponse)
 def update_question(
@@ -79,13 +125,16 @@ def update_question(
             detail="Not authorized to update this question"
         )
     
+    # dict() already converts the nested test cases to plain dicts
     for key, value in question_update.dict().items():
-        if key == "test_cases":
-            value = [tc.dict() for tc in value]
         setattr(db_question, key, value)
+    # Incremented in SQL so concurrent updates cannot both write the same version
+    db_question.version = Question.version + 1
     
     db.commit()
     db.refresh(db_question)
+    question_search.index(db_question)
+    question_cache.invalidate(question_id)
     
     return db_question
 
@@ -108,7 +157,14 @@ def delete_question(
             detail="Not authorized to delete this question"
         )
     
+    # Signatures reference the question (NOT NULL), so they go in the same transaction
+    db.query(SubmissionSignature).filter(
+        SubmissionSignature.question_id == question_id
+    ).delete(synchronize_session=False)
     db.delete(db_question)
     db.commit()
+    similarity_index.remove_question(question_id)
+    question_search.remove(question_id)
+    question_cache.invalidate(question_id)
     
     return {"message": "Question deleted successfully"}
\ No newline at end of file
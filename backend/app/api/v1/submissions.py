@@ -1,18 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import get_db
+from app.database import get_db, get_read_db, read_from_primary_if_stale
 from app.models.user import User
 from app.models.question import Question
 from app.models.submission import Submission, SubmissionStatus
-from app.schemas.submission import SubmissionCreate, SubmissionResponse
-from app.api.deps import get_current_student, get_current_user
-from app.services.test_runner import TestRunner
+from app.schemas.submission import (
+    SubmissionCreate, SubmissionResponse, SimilarSubmission, SubmissionCluster
+)
+from app.api.deps import get_current_student, get_current_reader, get_current_teacher_reader
+from app.services.test_stats import test_stats
+from app.services.similarity import similarity_index
+from app.services.ai_feedback import FeedbackJob, enqueue_feedback
+from app.services.archival import ArchiveUnavailableError, load_archived_fields
+from app.config import settings
 
 router = APIRouter()
 
 def process_submission(submission_id: int, db: Session):
     """Background task to process submission"""
+    # Imported here so API workers that never judge do not load the executors
+    from app.services.test_runner import TestRunner
+    
     submission = db.query(Submission).filter(Submission.id == submission_id).first()
     if not submission:
         return
@@ -34,7 +43,8 @@ def process_submission(submission_id: int, db: Session):
     status, passed, total, exec_time, error_msg = test_runner.run_tests(
         submission.code,
         submission.language,
-        question.test_cases
+        question.test_cases,
+        stats=test_stats.get(question.id, question.version, len(question.test_cases))
     )
     
     # Update submission
@@ -44,13 +54,30 @@ def process_submission(submission_id: int, db: Session):
     submission.execution_time = exec_time
     submission.error_message = error_msg if status != SubmissionStatus.ACCEPTED else None
     
-    # Calculate score
+    # Calculate score; partial credit is for the tests that passed before
+    # judging stopped at the first failure (see TestRunner.run_tests)
     if status == SubmissionStatus.ACCEPTED:
         submission.score = question.points
     else:
         submission.score = (passed / total) * question.points if total > 0 else 0
     
     db.commit()
+    
+    # Index for plagiarism detection now that the verdict is final
+    similarity_index.record_submission(db, submission)
+    
+    # AI feedback is generated asynchronously and written back later
+    if status != SubmissionStatus.ACCEPTED:
+        enqueue_feedback(FeedbackJob(
+            submission_id=submission.id,
+            question_id=question.id,
+            question_title=question.title,
+            question_description=question.description,
+            language=submission.language,
+            code=submission.code,
+            status=status,
+            error_message=error_msg
+        ))
 
 @router.post("/", response_model=SubmissionResponse)
 def submit_code(
@@ -89,8 +116,8 @@ def submit_code(
 def get_my_submissions(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     submissions = db.query(Submission).filter(
         Submission.student_id == current_user.id
@@ -101,10 +128,16 @@ def get_my_submissions(
 @router.get("/{submission_id}", response_model=SubmissionResponse)
 def get_submission(
     submission_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
-    submission = db.query(Submission).filter(Submission.id == submission_id).first()
+    # A submission polled while it is being judged may be missing or behind
+    # on the replica; re-read it from the primary until it has a verdict
+    submission = read_from_primary_if_stale(
+        db,
+        lambda session: session.query(Submission).filter(Submission.id == submission_id).first(),
+        lambda found: found is None or found.status in (SubmissionStatus.PENDING, SubmissionStatus.RUNNING)
+    )
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -118,6 +151,16 @@ def get_submission(
             detail="Not authorized to view this submission"
         )
     
+    if submission.archived:
+        try:
+            archived_fields = load_archived_fields(submission)
+        except ArchiveUnavailableError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The code of this archived submission is temporarily unavailable"
+            )
+        return SubmissionResponse.model_validate(submission).model_copy(update=archived_fields)
+    
     return submission
 
 @router.get("/question/{question_id}", response_model=List[SubmissionResponse])
@@ -125,8 +168,8 @@ def get_question_submissions(
     question_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     # Teachers can see all submissions for their questions
     if current_user.role.value == "teacher":
@@ -150,4 +193,59 @@ def get_question_submissions(
             Submission.student_id == current_user.id
         ).order_by(Submission.submitted_at.desc()).offset(skip).limit(limit).all()
     
-    return submissions
\ No newline at end of file
+    return submissions
+
+def _get_owned_question(question_id: int, teacher: User, db: Session) -> Question:
+    question = db.query(Question).filter(
+        Question.id == question_id,
+        Question.teacher_id == teacher.id
+    ).first()
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found or not authorized"
+        )
+    return question
+
+@router.get("/{submission_id}/similar", response_model=List[SimilarSubmission])
+def get_similar_submissions(
+    submission_id: int,
+    threshold: float = settings.SIMILARITY_THRESHOLD,
+    limit: int = 20,
+    db: Session = Depends(get_read_db),
+    current_teacher: User = Depends(get_current_teacher_reader)
+):
+    submission = db.query(Submission).filter(Submission.id == submission_id).first()
+    if not submission:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Submission not found"
+        )
+    
+    question = _get_owned_question(submission.question_id, current_teacher, db)
+    similarity_index.sync(db, question.id)
+    
+    matches = similarity_index.near_duplicates(question.id, submission.id, threshold, limit)
+    return [
+        SimilarSubmission(submission_id=sid, student_id=student_id, similarity=score)
+        for sid, student_id, score in matches
+    ]
+
+@router.get("/question/{question_id}/clusters", response_model=List[SubmissionCluster])
+def get_submission_clusters(
+    question_id: int,
+    threshold: float = settings.SIMILARITY_THRESHOLD,
+    db: Session = Depends(get_read_db),
+    current_teacher: User = Depends(get_current_teacher_reader)
+):
+    question = _get_owned_question(question_id, current_teacher, db)
+    similarity_index.sync(db, question.id)
+    
+    clusters = []
+    for members in similarity_index.clusters(question.id, threshold):
+        students = {similarity_index.student_of(question.id, sid) for sid in members}
+        clusters.append(SubmissionCluster(
+            submission_ids=members,
+            student_ids=sorted(students)
+        ))
+    return clusters
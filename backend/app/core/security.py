@@ -1,16 +1,21 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from functools import lru_cache
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    # passlib/bcrypt are only needed for register and login, so they are
+    # imported on first use instead of at worker startup
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -1,15 +1,163 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, TypeVar
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
 
+T = TypeVar("T")
+
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+class Replica:
+    def __init__(self, url: str, connect_timeout: Optional[int] = None):
+        connect_args = {}
+        if connect_timeout and make_url(url).get_backend_name() == "postgresql":
+            connect_args["connect_timeout"] = connect_timeout
+        self.engine = create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.healthy = False
+        self.checked_at = 0.0
+        self.check_lock = threading.Lock()
+
+    def lag(self) -> float:
+        """
+        Replication lag in seconds (0 for databases without streaming
+        replication, infinite for a replica that is not streaming from the
+        primary). On Postgres the checking role needs pg_monitor (or
+        pg_read_all_stats) to see the WAL receiver status.
+        """
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name != "postgresql":
+                conn.execute(text("SELECT 1"))
+                return 0.0
+            # A primary (not in recovery) reports no lag. A replica without a
+            # streaming WAL receiver has stopped receiving, so its receive
+            # and replay positions tell nothing about the primary: it is
+            # treated as arbitrarily far behind. A streaming replica that has
+            # replayed everything it received is caught up, however long ago
+            # the last transaction was; otherwise the age of the last
+            # replayed transaction measures the lag.
+            lag = conn.execute(text(
+                "SELECT CASE "
+                "WHEN NOT pg_is_in_recovery() THEN 0 "
+                "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+                "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            )).scalar()
+            return float("inf") if lag is None else float(lag)
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions for read-only requests. Replicas are health- and
+    lag-checked at most every ``check_interval`` seconds; a replica that is
+    unreachable or further behind than ``max_lag`` is skipped, and when none
+    qualify reads go to the primary.
+
+    Each check is made by one request while the others keep using the
+    previous result, so a slow or unreachable replica (bounded by
+    ``connect_timeout``) delays only the request that checks it.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        max_lag: float,
+        check_interval: float,
+        connect_timeout: Optional[int] = None
+    ):
+        self.replicas = [Replica(url, connect_timeout) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+
+    def _is_usable(self, replica: Replica) -> bool:
+        if time.monotonic() - replica.checked_at < self.check_interval:
+            return replica.healthy
+        if not replica.check_lock.acquire(blocking=False):
+            # Another request is checking this replica
+            return replica.healthy
+        try:
+            if time.monotonic() - replica.checked_at >= self.check_interval:
+                try:
+                    replica.healthy = replica.lag() <= self.max_lag
+                except Exception:
+                    replica.healthy = False
+                replica.checked_at = time.monotonic()
+        finally:
+            replica.check_lock.release()
+        return replica.healthy
+
+    def _pick(self) -> Optional[Replica]:
+        if self._cycle is None:
+            return None
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if self._is_usable(replica):
+                return replica
+        return None
+
+    def session(self) -> Session:
+        replica = self._pick()
+        if replica is None:
+            return SessionLocal()
+        db = replica.sessionmaker()
+        db.info["replica"] = True
+        return db
+
+
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    settings.REPLICA_MAX_LAG_SECONDS,
+    settings.REPLICA_HEALTH_CHECK_INTERVAL,
+    settings.REPLICA_CONNECT_TIMEOUT
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+if replica_router.replicas:
+    def get_read_db():
+        """Session for read-only routes; uses a replica when one is usable."""
+        db = replica_router.session()
+        try:
+            yield db
+        finally:
+            db.close()
+else:
+    # Without replicas reads go to the primary. Using the very same callable
+    # lets FastAPI share one session per request between a route and its
+    # dependencies instead of checking out two pooled connections.
+    get_read_db = get_db
+
+def read_from_primary_if_stale(
+    db: Session,
+    fetch: Callable[[Session], Optional[T]],
+    is_stale: Optional[Callable[[Optional[T]], bool]] = None
+) -> Optional[T]:
+    """
+    Run ``fetch`` on ``db`` and, if it ran on a replica and the result looks
+    stale, run it again on the primary. By default a result is stale when
+    nothing was found, which covers read-your-writes for rows the replica
+    has not replayed yet, such as a submission created a moment ago.
+    """
+    result = fetch(db)
+    stale = is_stale(result) if is_stale is not None else result is None
+    if stale and db.info.get("replica"):
+        primary = SessionLocal()
+        try:
+            result = fetch(primary)
+        finally:
+            primary.close()
+    return result
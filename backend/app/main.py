@@ -1,11 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
 from app.api.v1 import auth, questions, submissions
+from app.services.ai_feedback import start_feedback_pipeline, stop_feedback_pipeline
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by migrations (python -m app.migrate), so importing
+# the app never touches the database.
 
 app = FastAPI(title="Coding Platform API", version="1.0.0")
 
@@ -23,6 +23,14 @@ app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(questions.router, prefix="/api/v1/questions", tags=["questions"])
 app.include_router(submissions.router, prefix="/api/v1/submissions", tags=["submissions"])
 
+@app.on_event("startup")
+async def startup():
+    start_feedback_pipeline()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_feedback_pipeline()
+
 @app.get("/")
 def root():
     return {"message": "Coding Platform API"}
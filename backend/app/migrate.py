@@ -0,0 +1,105 @@
+"""
+Versioned schema migrations.
+
+Migrations live in ``app/migrations`` as ``NNNN_description.py`` modules
+exposing ``upgrade(conn)``. Applied versions are recorded in the
+``schema_migrations`` table. Run as a separate deploy step:
+
+    python -m app.migrate            # apply pending migrations
+    python -m app.migrate --status   # list applied and pending versions
+
+Databases created by the old ``create_all`` startup may already contain
+some of the objects a migration adds, so migrations check before creating.
+"""
+import argparse
+import importlib
+import os
+import re
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy import Column, DateTime, MetaData, String, Table, text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+_MIGRATION_RE = re.compile(r"^(\d{4})_\w+\.py$")
+
+# Arbitrary constant identifying the migration lock in pg_advisory_lock
+_ADVISORY_LOCK_ID = 4_815_162_342
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def discover() -> List[Tuple[str, str]]:
+    """(version, module name) for every migration, in version order."""
+    found = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = _MIGRATION_RE.match(filename)
+        if match:
+            found.append((match.group(1), f"app.migrations.{filename[:-3]}"))
+    return sorted(found)
+
+
+def applied_versions(conn: Connection) -> set:
+    schema_migrations.create(conn, checkfirst=True)
+    return {row[0] for row in conn.execute(schema_migrations.select())}
+
+
+def upgrade(engine: Engine) -> List[str]:
+    """Apply pending migrations, each in its own transaction. Returns the versions applied."""
+    applied = []
+    with engine.connect() as conn:
+        is_postgres = engine.dialect.name == "postgresql"
+        if is_postgres:
+            # Serialise concurrent deploys running migrations at the same time
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            conn.commit()
+        try:
+            with conn.begin():
+                done = applied_versions(conn)
+            for version, module_name in discover():
+                if version in done:
+                    continue
+                module = importlib.import_module(module_name)
+                with conn.begin():
+                    module.upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(
+                        version=version, applied_at=datetime.utcnow()
+                    ))
+                applied.append(version)
+        finally:
+            if is_postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+                conn.commit()
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--status", action="store_true", help="show migration status and exit")
+    args = parser.parse_args()
+
+    from app.database import engine
+
+    if args.status:
+        with engine.begin() as conn:
+            done = applied_versions(conn)
+        for version, module_name in discover():
+            state = "applied" if version in done else "pending"
+            print(f"{version}  {state:8}  {module_name.rsplit('.', 1)[-1]}")
+        return
+
+    applied = upgrade(engine)
+    if applied:
+        print(f"Applied migrations: {', '.join(applied)}")
+    else:
+        print("Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
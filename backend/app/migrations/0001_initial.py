@@ -0,0 +1,64 @@
+"""Baseline schema: users, questions and submissions as first released."""
+from sqlalchemy import (
+    Boolean, Column, DateTime, Enum, Float, ForeignKey, Integer, JSON, MetaData,
+    String, Table, Text
+)
+from app.models.user import UserRole
+from app.models.question import DifficultyLevel
+from app.models.submission import SubmissionStatus, ProgrammingLanguage
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("username", String, unique=True, index=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("full_name", String),
+    Column("role", Enum(UserRole)),
+    Column("is_active", Boolean),
+)
+
+questions = Table(
+    "questions",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("difficulty", Enum(DifficultyLevel)),
+    Column("points", Integer),
+    Column("time_limit", Integer),
+    Column("memory_limit", Integer),
+    Column("test_cases", JSON),
+    Column("constraints", Text),
+    Column("examples", JSON),
+    Column("hints", JSON),
+    Column("starter_code", JSON),
+    Column("teacher_id", Integer, ForeignKey("users.id")),
+)
+
+submissions = Table(
+    "submissions",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("code", Text, nullable=False),
+    Column("language", Enum(ProgrammingLanguage), nullable=False),
+    Column("status", Enum(SubmissionStatus)),
+    Column("test_cases_passed", Integer),
+    Column("total_test_cases", Integer),
+    Column("execution_time", Float),
+    Column("memory_used", Float),
+    Column("score", Float),
+    Column("error_message", Text),
+    Column("ai_feedback", Text),
+    Column("submitted_at", DateTime),
+    Column("student_id", Integer, ForeignKey("users.id")),
+    Column("question_id", Integer, ForeignKey("questions.id")),
+)
+
+
+def upgrade(conn):
+    # checkfirst keeps this a no-op on databases created by create_all
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,10 @@
+"""Add questions.version, the cache key bumped on every question update."""
+from sqlalchemy import inspect, text
+
+
+def upgrade(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("questions")}
+    if "version" not in columns:
+        conn.execute(text(
+            "ALTER TABLE questions ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+        ))
@@ -0,0 +1,18 @@
+"""Add submissions.archive_key and index history queries."""
+from sqlalchemy import inspect, text
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    columns = {c["name"] for c in inspector.get_columns("submissions")}
+    if "archive_key" not in columns:
+        conn.execute(text("ALTER TABLE submissions ADD COLUMN archive_key VARCHAR"))
+
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_submissions_student_submitted_at "
+        "ON submissions (student_id, submitted_at)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_submissions_question_submitted_at "
+        "ON submissions (question_id, submitted_at)"
+    ))
@@ -0,0 +1,13 @@
+"""GIN full-text index over question title, description and constraints (Postgres only)."""
+from sqlalchemy import text
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    # Must match question_search._DOCUMENT_SQL for the planner to use it
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_questions_search ON questions USING gin ("
+        "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '') "
+        "|| ' ' || coalesce(constraints, '')))"
+    ))
@@ -0,0 +1,25 @@
+"""Persisted MinHash signatures for the similarity index."""
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, LargeBinary, MetaData, Table
+)
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("questions", metadata, Column("id", Integer, primary_key=True))
+Table("submissions", metadata, Column("id", Integer, primary_key=True))
+
+submission_signatures = Table(
+    "submission_signatures",
+    metadata,
+    Column("submission_id", Integer, ForeignKey("submissions.id"), primary_key=True),
+    Column("question_id", Integer, ForeignKey("questions.id"), nullable=False),
+    Column("student_id", Integer, ForeignKey("users.id")),
+    Column("signature", LargeBinary, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_submission_signatures_question_created_at", "question_id", "created_at"),
+)
+
+
+def upgrade(conn):
+    submission_signatures.create(conn, checkfirst=True)
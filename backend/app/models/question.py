@@ -19,6 +19,9 @@ class Question(Base):
     time_limit = Column(Integer, default=2)  # seconds
     memory_limit = Column(Integer, default=256)  # MB
     
+    # Bumped on every update; part of the serialized-response cache key
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     # Test cases stored as JSON
     test_cases = Column(JSON)  # [{"input": "", "output": "", "is_sample": true}]
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -24,6 +24,7 @@ class Submission(Base):
     __tablename__ = "submissions"
     
     id = Column(Integer, primary_key=True, index=True)
+    # Blanked once the submission is archived; see archive_key
     code = Column(Text, nullable=False)
     language = Column(Enum(ProgrammingLanguage), nullable=False)
     status = Column(Enum(SubmissionStatus), default=SubmissionStatus.PENDING)
@@ -44,9 +45,22 @@ class Submission(Base):
     # Timestamps
     submitted_at = Column(DateTime, default=datetime.utcnow)
     
+    # Cold storage key for code/error_message/ai_feedback of old submissions
+    archive_key = Column(String)
+    
     student_id = Column(Integer, ForeignKey("users.id"))
     question_id = Column(Integer, ForeignKey("questions.id"))
     
     # Relationships
     student = relationship("User", back_populates="submissions")
-    question = relationship("Question", back_populates="submissions")
\ No newline at end of file
+    question = relationship("Question", back_populates="submissions")
+    
+    # History queries filter by student or question and sort by time
+    __table_args__ = (
+        Index("ix_submissions_student_submitted_at", "student_id", "submitted_at"),
+        Index("ix_submissions_question_submitted_at", "question_id", "submitted_at"),
+    )
+    
+    @property
+    def archived(self) -> bool:
+        return self.archive_key is not None
\ No newline at end of file
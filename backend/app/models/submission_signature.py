@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, LargeBinary, Index
+from datetime import datetime
+from app.database import Base
+
+class SubmissionSignature(Base):
+    """MinHash signature of a judged submission, written when its verdict lands."""
+    __tablename__ = "submission_signatures"
+    
+    submission_id = Column(Integer, ForeignKey("submissions.id"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id"))
+    signature = Column(LargeBinary, nullable=False)  # packed little-endian uint32s
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Indexes sync by (question, time written)
+    __table_args__ = (
+        Index("ix_submission_signatures_question_created_at", "question_id", "created_at"),
+    )
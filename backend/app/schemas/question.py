@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict
 from app.models.question import DifficultyLevel
 
@@ -33,6 +33,14 @@ class QuestionResponse(QuestionBase):
     class Config:
         from_attributes = True
 
+class StudentQuestionResponse(QuestionResponse):
+    """Question as seen by students: hidden test cases are stripped."""
+    
+    @field_validator("test_cases")
+    @classmethod
+    def only_samples(cls, test_cases: List[TestCase]) -> List[TestCase]:
+        return [tc for tc in test_cases if tc.is_sample]
+
 class QuestionListResponse(BaseModel):
     id: int
     title: str
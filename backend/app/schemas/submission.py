@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from app.models.submission import SubmissionStatus, ProgrammingLanguage
 
@@ -10,7 +10,7 @@ class SubmissionCreate(BaseModel):
 
 class SubmissionResponse(BaseModel):
     id: int
-    code: str
+    code: str  # empty for archived submissions outside get_submission
     language: ProgrammingLanguage
     status: SubmissionStatus
     test_cases_passed: int
@@ -22,6 +22,16 @@ class SubmissionResponse(BaseModel):
     ai_feedback: Optional[str]
     submitted_at: datetime
     question_id: int
+    archived: bool = False
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SimilarSubmission(BaseModel):
+    submission_id: int
+    student_id: int
+    similarity: float
+
+class SubmissionCluster(BaseModel):
+    submission_ids: List[int]
+    student_ids: List[int]
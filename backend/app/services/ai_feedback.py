@@ -0,0 +1,406 @@
+import abc
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+from app.config import settings
+from app.models.submission import ProgrammingLanguage, SubmissionStatus
+from app.services.similarity import normalize_tokens
+
+logger = logging.getLogger(__name__)
+
+FeedbackKey = Tuple[int, str, str]
+
+
+@dataclass
+class FeedbackJob:
+    submission_id: int
+    question_id: int
+    question_title: str
+    question_description: str
+    language: ProgrammingLanguage
+    code: str
+    status: SubmissionStatus
+    error_message: Optional[str]
+    attempts: int = 0
+
+    @property
+    def error_signature(self) -> str:
+        """
+        Verdict plus the last line of the error with numbers and quoted
+        values stripped, e.g. "runtime_error:IndexError: list index out of range".
+        """
+        message = (self.error_message or "").strip().splitlines()
+        last_line = message[-1] if message else ""
+        last_line = re.sub(r"test case \d+", "test case", last_line)
+        last_line = re.sub(r"\"[^\"]*\"|'[^']*'", "''", last_line)
+        last_line = re.sub(r"\d+", "N", last_line)
+        return f"{self.status.value}:{last_line}"
+
+    @property
+    def code_hash(self) -> str:
+        tokens = normalize_tokens(self.code, self.language)
+        return hashlib.sha1(" ".join(tokens).encode()).hexdigest()
+
+    @property
+    def key(self) -> FeedbackKey:
+        return (self.question_id, self.error_signature, self.code_hash)
+
+
+class FeedbackProviderError(Exception):
+    """
+    A completion failed. ``retryable`` marks rate limits and transient
+    server or network errors; ``retry_after`` is the delay the provider
+    asked for, if any.
+    """
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+FeedbackResult = Union[str, BaseException]
+
+
+class FeedbackProvider(abc.ABC):
+    """Interface for model backends. Receives a deduplicated batch of jobs."""
+
+    @abc.abstractmethod
+    async def generate(self, jobs: List[FeedbackJob]) -> List[FeedbackResult]:
+        """
+        One result per job, in order: the feedback text, or the exception
+        that job failed with. A failing job must not fail the others.
+        """
+
+
+class StubFeedbackProvider(FeedbackProvider):
+    """Offline backend producing deterministic feedback from the verdict alone."""
+
+    HINTS = {
+        SubmissionStatus.WRONG_ANSWER: "Your program ran but produced the wrong output. "
+                                       "Re-check edge cases such as empty input, "
+                                       "single elements and the largest allowed values.",
+        SubmissionStatus.TIME_LIMIT_EXCEEDED: "Your program is too slow. Look for nested "
+                                              "loops over the input and consider a more "
+                                              "efficient algorithm or data structure.",
+        SubmissionStatus.RUNTIME_ERROR: "Your program crashed. Read the error message "
+                                        "and check indexing, division and input parsing.",
+        SubmissionStatus.MEMORY_LIMIT_EXCEEDED: "Your program used too much memory. "
+                                                "Avoid storing data you do not need.",
+        SubmissionStatus.COMPILATION_ERROR: "Your program does not compile. Fix the "
+                                            "syntax errors reported by the compiler.",
+    }
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, jobs: List[FeedbackJob]) -> List[FeedbackResult]:
+        self.calls += 1
+        return [
+            self.HINTS.get(job.status, "Review your solution against the problem statement.")
+            for job in jobs
+        ]
+
+
+class OpenAICompatibleProvider(FeedbackProvider):
+    """Chat-completions backend, used for both OpenAI and Groq."""
+
+    def __init__(self, api_key: str, base_url: str, model: str, max_concurrency: int):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _prompt(self, job: FeedbackJob) -> str:
+        return (
+            f"Problem: {job.question_title}\n\n{job.question_description}\n\n"
+            f"Language: {job.language.value}\n"
+            f"Verdict: {job.status.value}\n"
+            f"Error: {job.error_message or 'none'}\n\n"
+            f"Code:\n{job.code}\n\n"
+            "Give the student a short hint (at most 3 sentences) explaining what is "
+            "likely wrong. Do not give the full solution."
+        )
+
+    async def _complete(self, client, job: FeedbackJob) -> str:
+        async with self._semaphore:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": self._prompt(job)}],
+                    "max_tokens": 200,
+                },
+            )
+            if response.status_code == 429 or response.status_code >= 500:
+                retry_after = response.headers.get("retry-after")
+                raise FeedbackProviderError(
+                    f"{self.base_url} returned {response.status_code}",
+                    retryable=True,
+                    retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+                )
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"].strip()
+
+    async def generate(self, jobs: List[FeedbackJob]) -> List[FeedbackResult]:
+        import httpx
+
+        async def complete(client, job):
+            try:
+                return await self._complete(client, job)
+            except httpx.TransportError as exc:
+                raise FeedbackProviderError(str(exc), retryable=True) from exc
+
+        async with httpx.AsyncClient(timeout=30) as client:
+            return await asyncio.gather(
+                *(complete(client, job) for job in jobs),
+                return_exceptions=True
+            )
+
+
+def get_feedback_provider() -> Optional[FeedbackProvider]:
+    name = settings.AI_FEEDBACK_PROVIDER
+    if name is None:
+        if settings.OPENAI_API_KEY:
+            name = "openai"
+        elif settings.GROQ_API_KEY:
+            name = "groq"
+        else:
+            return None
+
+    if name == "stub":
+        return StubFeedbackProvider()
+    if name == "openai" and settings.OPENAI_API_KEY:
+        return OpenAICompatibleProvider(
+            settings.OPENAI_API_KEY,
+            "https://api.openai.com/v1",
+            settings.AI_FEEDBACK_MODEL or "gpt-4o-mini",
+            settings.AI_FEEDBACK_MAX_CONCURRENCY
+        )
+    if name == "groq" and settings.GROQ_API_KEY:
+        return OpenAICompatibleProvider(
+            settings.GROQ_API_KEY,
+            "https://api.groq.com/openai/v1",
+            settings.AI_FEEDBACK_MODEL or "llama-3.1-8b-instant",
+            settings.AI_FEEDBACK_MAX_CONCURRENCY
+        )
+    return None
+
+
+class FeedbackCache:
+    """LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[FeedbackKey, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: FeedbackKey) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: FeedbackKey, value: str):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FeedbackPipeline:
+    """
+    Generates AI feedback for failed submissions off the judging path.
+
+    Jobs are queued from the judge, collected into batches of up to
+    ``batch_size`` (or whatever arrives within ``batch_wait`` seconds),
+    deduplicated by (question, error signature, normalized code hash) and
+    answered from the cache where possible. Only the remaining unique jobs
+    reach the provider. Jobs that fail with a retryable provider error
+    (rate limit, 5xx, network) are requeued with exponential backoff, up to
+    ``max_attempts`` tries; other failures are logged and dropped.
+    """
+
+    def __init__(
+        self,
+        provider: FeedbackProvider,
+        batch_size: int = 16,
+        batch_wait: float = 0.5,
+        cache_size: int = 1024,
+        cache_ttl: float = 3600,
+        save=None,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0
+    ):
+        self.provider = provider
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.cache = FeedbackCache(cache_size, cache_ttl)
+        self.save = save or save_feedback
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = self._loop.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def enqueue(self, job: FeedbackJob):
+        """Thread-safe; called from the judge running in the threadpool."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+
+    async def _next_batch(self) -> List[FeedbackJob]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _retry(self, jobs: List[FeedbackJob], error: FeedbackProviderError):
+        """Requeue jobs after a transient failure, backing off exponentially."""
+        attempts = jobs[0].attempts + 1
+        if attempts >= self.max_attempts:
+            logger.error(
+                "Giving up on AI feedback for submissions %s after %d attempts: %s",
+                [job.submission_id for job in jobs], attempts, error
+            )
+            return
+        delay = error.retry_after or self.retry_delay * 2 ** (attempts - 1)
+        logger.warning(
+            "AI feedback for submissions %s failed (%s); retrying in %.1fs",
+            [job.submission_id for job in jobs], error, delay
+        )
+        for job in jobs:
+            job.attempts = attempts
+            self._loop.call_later(delay, self._queue.put_nowait, job)
+
+    async def process_batch(self, batch: List[FeedbackJob]):
+        results: Dict[int, str] = {}
+        pending: Dict[FeedbackKey, List[FeedbackJob]] = {}
+
+        for job in batch:
+            key = job.key
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[job.submission_id] = cached
+            else:
+                pending.setdefault(key, []).append(job)
+
+        if pending:
+            keys = list(pending)
+            try:
+                feedback = await self.provider.generate([pending[key][0] for key in keys])
+            except Exception as exc:
+                feedback = [exc] * len(keys)
+            for key, text in zip(keys, feedback):
+                if isinstance(text, FeedbackProviderError) and text.retryable:
+                    self._retry(pending[key], text)
+                elif isinstance(text, BaseException):
+                    logger.error(
+                        "AI feedback for submissions %s failed: %r",
+                        [job.submission_id for job in pending[key]], text
+                    )
+                else:
+                    self.cache.set(key, text)
+                    for job in pending[key]:
+                        results[job.submission_id] = text
+
+        if results:
+            await asyncio.to_thread(self.save, results)
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.process_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Feedback is best-effort; a failed save must not stop the worker
+                logger.exception(
+                    "Failed to store AI feedback for submissions %s",
+                    [job.submission_id for job in batch]
+                )
+
+
+def save_feedback(results: Dict[int, str]):
+    from app.database import SessionLocal
+    from app.models.submission import Submission
+
+    db = SessionLocal()
+    try:
+        submissions = db.query(Submission).filter(Submission.id.in_(list(results))).all()
+        for submission in submissions:
+            submission.ai_feedback = results[submission.id]
+        db.commit()
+    finally:
+        db.close()
+
+
+def create_feedback_pipeline() -> Optional[FeedbackPipeline]:
+    provider = get_feedback_provider()
+    if provider is None:
+        return None
+    return FeedbackPipeline(
+        provider,
+        batch_size=settings.AI_FEEDBACK_BATCH_SIZE,
+        batch_wait=settings.AI_FEEDBACK_BATCH_WAIT,
+        cache_size=settings.AI_FEEDBACK_CACHE_SIZE,
+        cache_ttl=settings.AI_FEEDBACK_CACHE_TTL
+    )
+
+
+feedback_pipeline: Optional[FeedbackPipeline] = None
+
+
+def start_feedback_pipeline():
+    global feedback_pipeline
+    feedback_pipeline = create_feedback_pipeline()
+    if feedback_pipeline is not None:
+        feedback_pipeline.start()
+
+
+async def stop_feedback_pipeline():
+    global feedback_pipeline
+    if feedback_pipeline is not None:
+        await feedback_pipeline.stop()
+        feedback_pipeline = None
+
+
+def enqueue_feedback(job: FeedbackJob):
+    if feedback_pipeline is not None:
+        feedback_pipeline.enqueue(job)
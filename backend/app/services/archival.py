@@ -0,0 +1,182 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.submission import Submission, SubmissionStatus
+
+ARCHIVED_FIELDS = ("code", "error_message", "ai_feedback")
+
+ArchivedFields = Dict[str, Optional[str]]
+
+
+class ArchiveUnavailableError(Exception):
+    """An archived submission body cannot be read (archive unset, missing or unreadable)."""
+
+
+class ArchiveStore:
+    """
+    Compressed cold storage for submission bodies.
+
+    Bodies are packed one file per archival batch and month of submission
+    (``<root>/<YYYY-MM>/<first id>-<last id>.json.gz``), so whole months can
+    be moved to cheaper storage or dropped together without creating a file
+    per submission. A submission's key is ``<pack path>#<submission id>``.
+    Recently read packs are kept decompressed in a small LRU.
+
+    ``root`` must be an absolute path that every API host can read, since
+    any host may serve an archived submission.
+    """
+
+    def __init__(self, root: str, cached_packs: int = 8):
+        if not os.path.isabs(root):
+            raise ValueError(f"ARCHIVE_DIR must be an absolute path on shared storage, got {root!r}")
+        self.root = root
+        self.cached_packs = cached_packs
+        self._packs: "OrderedDict[str, Dict[str, ArchivedFields]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def partition_for(submission: Submission) -> str:
+        return (submission.submitted_at or datetime.utcnow()).strftime("%Y-%m")
+
+    def put_pack(self, partition: str, bodies: Dict[int, ArchivedFields]) -> str:
+        """Write one pack of bodies keyed by submission id; returns the pack path."""
+        pack = f"{partition}/{min(bodies)}-{max(bodies)}.json.gz"
+        path = os.path.join(self.root, pack)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+            json.dump({str(sid): body for sid, body in bodies.items()}, f)
+        os.replace(tmp_path, path)
+        return pack
+
+    def _load_pack(self, pack: str) -> Dict[str, ArchivedFields]:
+        with self._lock:
+            bodies = self._packs.get(pack)
+            if bodies is not None:
+                self._packs.move_to_end(pack)
+                return bodies
+
+        try:
+            with gzip.open(os.path.join(self.root, pack), "rt", encoding="utf-8") as f:
+                bodies = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise ArchiveUnavailableError(f"Archive pack {pack} is unreadable: {exc}") from exc
+
+        with self._lock:
+            self._packs[pack] = bodies
+            while len(self._packs) > self.cached_packs:
+                self._packs.popitem(last=False)
+        return bodies
+
+    def get(self, key: str) -> ArchivedFields:
+        pack, _, submission_id = key.partition("#")
+        body = self._load_pack(pack).get(submission_id)
+        if body is None:
+            raise ArchiveUnavailableError(f"Submission {submission_id} is missing from archive pack {pack}")
+        return body
+
+
+_archive_store: Optional[ArchiveStore] = None
+
+
+def get_archive_store() -> ArchiveStore:
+    global _archive_store
+    if _archive_store is None:
+        if not settings.ARCHIVE_DIR:
+            raise ArchiveUnavailableError("ARCHIVE_DIR is not configured")
+        if not os.path.isabs(settings.ARCHIVE_DIR):
+            raise ArchiveUnavailableError(
+                f"ARCHIVE_DIR must be an absolute path on shared storage, got {settings.ARCHIVE_DIR!r}"
+            )
+        _archive_store = ArchiveStore(settings.ARCHIVE_DIR)
+    return _archive_store
+
+
+def load_archived_fields(submission: Submission) -> ArchivedFields:
+    """
+    Archived bodies for the submission, or its live columns if not archived.
+    Raises ArchiveUnavailableError if the archive cannot be read.
+    """
+    if submission.archive_key is None:
+        return {field: getattr(submission, field) for field in ARCHIVED_FIELDS}
+    return get_archive_store().get(submission.archive_key)
+
+
+def archive_submissions(
+    db: Session,
+    older_than: datetime,
+    batch_size: int = 500,
+    store: Optional[ArchiveStore] = None
+) -> int:
+    """
+    Move code, error_message and ai_feedback of finished submissions made
+    before ``older_than`` into the archive store, leaving the verdict row
+    in place. Returns the number of submissions archived.
+    """
+    store = store or get_archive_store()
+    archived = 0
+    while True:
+        batch: List[Submission] = db.query(Submission).filter(
+            Submission.submitted_at < older_than,
+            Submission.archive_key.is_(None),
+            Submission.status.notin_([SubmissionStatus.PENDING, SubmissionStatus.RUNNING])
+        ).order_by(Submission.id).limit(batch_size).all()
+        if not batch:
+            return archived
+
+        partitions: Dict[str, List[Submission]] = {}
+        for submission in batch:
+            partitions.setdefault(store.partition_for(submission), []).append(submission)
+
+        for partition, submissions in partitions.items():
+            # The pack is written before the rows are cleared, so a crash
+            # between the two leaves the submissions intact.
+            pack = store.put_pack(partition, {
+                s.id: {field: getattr(s, field) for field in ARCHIVED_FIELDS}
+                for s in submissions
+            })
+            for submission in submissions:
+                # code is NOT NULL in the baseline schema, so it is blanked
+                # rather than nulled
+                submission.code = ""
+                submission.error_message = None
+                submission.ai_feedback = None
+                submission.archive_key = f"{pack}#{submission.id}"
+
+        db.commit()
+        archived += len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old submission bodies to cold storage")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    try:
+        store = get_archive_store()
+    except ArchiveUnavailableError as exc:
+        sys.exit(f"Cannot archive: {exc}")
+
+    from app.database import SessionLocal
+    from app.models import user, question  # noqa: F401 - register mappers
+
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=args.older_than_days)
+        count = archive_submissions(db, cutoff, args.batch_size, store)
+        print(f"Archived {count} submissions older than {cutoff:%Y-%m-%d}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
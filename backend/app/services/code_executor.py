@@ -2,13 +2,20 @@ import subprocess
 import tempfile
 import os
 import time
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from app.models.submission import ProgrammingLanguage
+from app.services.sandbox_scheduler import SandboxScheduler, sandbox_scheduler, pinned_command
 
 class CodeExecutor:
-    def __init__(self, time_limit: int = 2, memory_limit: int = 256):
+    def __init__(
+        self,
+        time_limit: int = 2,
+        memory_limit: int = 256,
+        scheduler: SandboxScheduler = sandbox_scheduler
+    ):
         self.time_limit = time_limit
         self.memory_limit = memory_limit
+        self.scheduler = scheduler
     
     def execute(
         self,
@@ -27,15 +34,14 @@ class CodeExecutor:
         else:
             return "", "Language not supported", 0, False
     
-    def _execute_python(self, code: str, test_input: str) -> Tuple[str, str, float, bool]:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-        
-        try:
+    def _run(self, command: List[str], test_input: str) -> Tuple[str, str, float, bool]:
+        """Run a prepared program on a dedicated CPU once the scheduler grants one."""
+        with self.scheduler.slot() as cpu:
+            # Timing starts after the slot is granted, so queueing under load
+            # never counts against the time limit
             start_time = time.time()
             process = subprocess.Popen(
-                ['python', temp_file],
+                pinned_command(command, cpu),
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -54,8 +60,17 @@ class CodeExecutor:
             
             except subprocess.TimeoutExpired:
                 process.kill()
+                # Reap the child before its CPU is handed to the next run
+                process.communicate()
                 return "", "Time Limit Exceeded", self.time_limit, False
+    
+    def _execute_python(self, code: str, test_input: str) -> Tuple[str, str, float, bool]:
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+            f.write(code)
+            temp_file = f.name
         
+        try:
+            return self._run(['python', temp_file], test_input)
         finally:
             os.unlink(temp_file)
     
@@ -82,28 +97,6 @@ rl.on('close', () => {{
             temp_file = f.name
         
         try:
-            start_time = time.time()
-            process = subprocess.Popen(
-                ['node', temp_file],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            try:
-                stdout, stderr = process.communicate(
-                    input=test_input,
-                    timeout=self.time_limit
-                )
-                execution_time = time.time() - start_time
-                success = process.returncode == 0
-                
-                return stdout.strip(), stderr.strip(), execution_time, success
-            
-            except subprocess.TimeoutExpired:
-                process.kill()
-                return "", "Time Limit Exceeded", self.time_limit, False
-        
+            return self._run(['node', temp_file], test_input)
         finally:
             os.unlink(temp_file)
\ No newline at end of file
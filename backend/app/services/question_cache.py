@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+from app.config import settings
+from app.models.question import Question
+from app.models.user import User, UserRole
+from app.schemas.question import QuestionResponse, StudentQuestionResponse
+
+CacheKey = Tuple[int, int, str]
+
+FULL_VIEW = "full"
+STUDENT_VIEW = "student"
+
+
+def question_view(user: User) -> str:
+    return STUDENT_VIEW if user.role == UserRole.STUDENT else FULL_VIEW
+
+
+def serialize_question(question: Question, view: str) -> bytes:
+    schema = StudentQuestionResponse if view == STUDENT_VIEW else QuestionResponse
+    # pydantic-core serializes straight to JSON bytes without building dicts
+    return schema.model_validate(question).model_dump_json().encode()
+
+
+class QuestionResponseCache:
+    """
+    LRU cache of serialized question detail responses keyed by
+    (question id, version, view), bounded by total size in bytes.
+
+    Because the version is part of the key, a worker that missed an
+    invalidation still never serves a stale body: it simply misses.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._keys_by_question: Dict[int, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, question_id: int, version: int, view: str) -> Optional[bytes]:
+        key = (question_id, version, view)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, question_id: int, version: int, view: str, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        key = (question_id, version, view)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = body
+            self._keys_by_question.setdefault(question_id, set()).add(key)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate(self, question_id: int):
+        with self._lock:
+            for key in list(self._keys_by_question.get(question_id, ())):
+                self._discard(key)
+
+    def _discard(self, key: CacheKey):
+        body = self._entries.pop(key, None)
+        if body is None:
+            return
+        self.size -= len(body)
+        keys = self._keys_by_question.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_question[key[0]]
+
+
+question_cache = QuestionResponseCache(settings.QUESTION_CACHE_MAX_BYTES)
@@ -0,0 +1,209 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.models.question import Question, DifficultyLevel
+
+SEARCH_CONFIG = "english"
+
+# The same expression is used by the GIN index (migration 0004) and by
+# queries so that Postgres can answer searches from the index alone.
+_DOCUMENT_SQL = (
+    f"to_tsvector('{SEARCH_CONFIG}', "
+    "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(constraints, ''))"
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with",
+}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+@dataclass
+class SearchFilters:
+    difficulty: Optional[DifficultyLevel] = None
+    min_points: Optional[int] = None
+    max_points: Optional[int] = None
+    teacher_id: Optional[int] = None
+
+
+def _apply_filters(query, filters: SearchFilters):
+    if filters.difficulty is not None:
+        query = query.filter(Question.difficulty == filters.difficulty)
+    if filters.min_points is not None:
+        query = query.filter(Question.points >= filters.min_points)
+    if filters.max_points is not None:
+        query = query.filter(Question.points <= filters.max_points)
+    if filters.teacher_id is not None:
+        query = query.filter(Question.teacher_id == filters.teacher_id)
+    return query
+
+
+class PostgresSearchBackend:
+    """Full-text search backed by the expression GIN index on questions."""
+
+    def index(self, question: Question):
+        # The expression index is maintained by Postgres itself
+        pass
+
+    def remove(self, question_id: int):
+        pass
+
+    def search(
+        self,
+        db: Session,
+        text: str,
+        filters: SearchFilters,
+        skip: int,
+        limit: int
+    ) -> List[Question]:
+        document = literal_column(_DOCUMENT_SQL)
+        query = _apply_filters(db.query(Question), filters)
+        if text.strip():
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+            query = query.filter(document.op("@@")(ts_query)).order_by(
+                func.ts_rank(document, ts_query).desc(), Question.id
+            )
+        else:
+            query = query.order_by(Question.id)
+        return query.offset(skip).limit(limit).all()
+
+
+class InvertedIndexBackend:
+    """
+    In-process inverted index used when the database has no full-text
+    support (e.g. SQLite).
+
+    Each worker process keeps its own copy. It is built lazily on the first
+    search and then reconciled with the ``questions`` table at most every
+    ``refresh_interval`` seconds by comparing question versions, so
+    creates, edits and deletes made through other workers show up within
+    that interval. Writes made through this worker are applied at once.
+    """
+
+    def __init__(self, refresh_interval: float = 1.0):
+        self.refresh_interval = refresh_interval
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._terms: Dict[int, Set[str]] = {}
+        self._versions: Dict[int, int] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _add(self, question_id: int, version: int, title, description, constraints):
+        self._remove(question_id)
+        self._versions[question_id] = version
+        counts: Dict[str, int] = defaultdict(int)
+        # Title matches count more towards the rank than body matches
+        for term in tokenize(title):
+            counts[term] += 3
+        for term in tokenize(description) + tokenize(constraints):
+            counts[term] += 1
+        for term, count in counts.items():
+            self._postings[term][question_id] = count
+        self._terms[question_id] = set(counts)
+
+    def _remove(self, question_id: int):
+        self._versions.pop(question_id, None)
+        for term in self._terms.pop(question_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(question_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _refresh(self, db: Session):
+        """Re-index questions whose version changed and drop deleted ones."""
+        now = time.monotonic()
+        if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+            return
+        current = dict(db.query(Question.id, Question.version).all())
+        with self._lock:
+            changed = [qid for qid, version in current.items() if self._versions.get(qid) != version]
+            deleted = [qid for qid in self._versions if qid not in current]
+
+        rows = []
+        for start in range(0, len(changed), 500):
+            rows.extend(db.query(
+                Question.id, Question.version, Question.title, Question.description, Question.constraints
+            ).filter(Question.id.in_(changed[start:start + 500])).all())
+
+        with self._lock:
+            for qid in deleted:
+                self._remove(qid)
+            for row in rows:
+                self._add(*row)
+            self._refreshed_at = now
+
+    def index(self, question: Question):
+        with self._lock:
+            self._add(
+                question.id, question.version, question.title, question.description, question.constraints
+            )
+
+    def remove(self, question_id: int):
+        with self._lock:
+            self._remove(question_id)
+
+    def _match(self, terms: List[str]) -> List[int]:
+        postings = [self._postings.get(term) for term in terms]
+        if not postings or any(p is None for p in postings):
+            return []
+        # Intersect starting from the rarest term
+        postings.sort(key=len)
+        matched = set(postings[0])
+        for p in postings[1:]:
+            matched &= p.keys()
+            if not matched:
+                return []
+        scores = {qid: sum(p[qid] for p in postings) for qid in matched}
+        return sorted(matched, key=lambda qid: (-scores[qid], qid))
+
+    def search(
+        self,
+        db: Session,
+        text: str,
+        filters: SearchFilters,
+        skip: int,
+        limit: int
+    ) -> List[Question]:
+        terms = tokenize(text)
+        query = _apply_filters(db.query(Question), filters)
+        if not terms:
+            return query.order_by(Question.id).offset(skip).limit(limit).all()
+
+        self._refresh(db)
+        with self._lock:
+            ranked = self._match(terms)
+        if not ranked:
+            return []
+
+        # Filters are applied by the database on the matched ids, in chunks,
+        # until the requested page is filled.
+        results: List[Question] = []
+        wanted = skip + limit
+        chunk_size = max(wanted, 200)
+        for start in range(0, len(ranked), chunk_size):
+            chunk = ranked[start:start + chunk_size]
+            found = {q.id: q for q in query.filter(Question.id.in_(chunk)).all()}
+            results.extend(found[qid] for qid in chunk if qid in found)
+            if len(results) >= wanted:
+                break
+        return results[skip:wanted]
+
+
+if engine.dialect.name == "postgresql":
+    question_search = PostgresSearchBackend()
+else:
+    question_search = InvertedIndexBackend()
@@ -0,0 +1,144 @@
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Optional, Set
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# How often the head of the queue retries when every CPU is held by
+# another worker process on the host
+HOST_POLL_INTERVAL = 0.01
+
+TASKSET = shutil.which("taskset")
+
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pinned_command(command: List[str], cpu: Optional[int]) -> List[str]:
+    """
+    ``command`` prefixed with ``taskset`` so the program is pinned to ``cpu``
+    before it starts. Without taskset it runs unpinned; the scheduler still
+    caps concurrency at one run per CPU.
+    """
+    if cpu is None or TASKSET is None:
+        return command
+    return [TASKSET, "-c", str(cpu), *command]
+
+
+def ensure_private_dir(path: str):
+    """Create ``path`` as 0700 if missing and check that only this user can write to it."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(
+            f"Sandbox lock directory {path} must be a directory owned by uid {os.getuid()} "
+            "and not accessible to other users"
+        )
+
+
+class SandboxScheduler:
+    """
+    Caps concurrent sandboxed runs on a host at one per CPU and hands each
+    run a dedicated CPU to pin to.
+
+    Within a process, waiting runs are granted CPUs in arrival (FIFO) order.
+    Across worker processes on the same host, each CPU is claimed with an
+    exclusive ``flock`` on ``<lock_dir>/cpu-<n>.lock``; when all of them are
+    taken, the head of each process's queue polls every
+    ``HOST_POLL_INTERVAL`` seconds. This caps host-wide concurrency but does
+    not order waiters across processes: whichever process polls first after
+    a CPU is released gets it.
+    """
+
+    def __init__(self, cpus: List[int], lock_dir: Optional[str] = None):
+        self.cpus = list(cpus)
+        self.lock_dir = lock_dir if fcntl is not None else None
+        if self.lock_dir:
+            ensure_private_dir(self.lock_dir)
+        self._free: Set[int] = set(self.cpus)
+        self._cond = threading.Condition()
+        self._waiters: Deque[object] = deque()
+
+    def _claim_host_lock(self, cpu: int) -> Optional[int]:
+        """Open file descriptor holding the CPU's host-wide lock, or None if taken."""
+        fd = os.open(os.path.join(self.lock_dir, f"cpu-{cpu}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _try_claim(self):
+        """Called with the condition held by the head of the queue."""
+        for cpu in sorted(self._free):
+            if self.lock_dir is None:
+                self._free.discard(cpu)
+                return cpu, None
+            fd = self._claim_host_lock(cpu)
+            if fd is not None:
+                self._free.discard(cpu)
+                return cpu, fd
+        return None
+
+    @contextmanager
+    def slot(self) -> Iterator[int]:
+        """Block until a CPU is free; yields the CPU to pin to."""
+        ticket = object()
+        with self._cond:
+            self._waiters.append(ticket)
+            while True:
+                if self._waiters[0] is ticket:
+                    claimed = self._try_claim()
+                    if claimed is not None:
+                        break
+                    # CPUs free in this process are held by other processes
+                    timeout = HOST_POLL_INTERVAL if self._free else None
+                else:
+                    timeout = None
+                self._cond.wait(timeout)
+
+            cpu, fd = claimed
+            self._waiters.popleft()
+            self._cond.notify_all()
+
+        try:
+            yield cpu
+        finally:
+            if fd is not None:
+                os.close(fd)  # releases the flock
+            with self._cond:
+                self._free.add(cpu)
+                self._cond.notify_all()
+
+
+def _create_scheduler() -> SandboxScheduler:
+    allowed = available_cpus()
+    cpus = [int(cpu) for cpu in settings.SANDBOX_CPUS] or allowed
+    unavailable = sorted(set(cpus) - set(allowed))
+    if unavailable:
+        raise ValueError(
+            f"SANDBOX_CPUS {unavailable} are outside this process's CPU affinity {allowed}"
+        )
+    if settings.SANDBOX_MAX_CONCURRENCY:
+        cpus = cpus[:settings.SANDBOX_MAX_CONCURRENCY]
+    lock_dir = settings.SANDBOX_LOCK_DIR
+    if lock_dir is None and fcntl is not None:
+        # Per-user so another account on the host cannot pre-create or hold the locks
+        lock_dir = os.path.join(tempfile.gettempdir(), f"problemhub-sandbox-{os.getuid()}")
+    return SandboxScheduler(cpus, lock_dir)
+
+
+sandbox_scheduler = _create_scheduler()
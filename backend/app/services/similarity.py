@@ -0,0 +1,377 @@
+import argparse
+import random
+import re
+import struct
+import threading
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.models.submission import ProgrammingLanguage
+
+# MinHash / LSH parameters. 16 bands of 8 rows puts the LSH threshold at
+# roughly (1/16) ** (1/8) ~= 0.71 estimated Jaccard similarity.
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+SHINGLE_SIZE = 5
+
+# Persisted signatures are re-read this far back on every sync
+SYNC_OVERLAP = timedelta(minutes=5)
+
+_SIGNATURE_STRUCT = struct.Struct(f"<{NUM_PERMUTATIONS}I")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_TOKEN_RE = re.compile(
+    r'"(?:\\.|[^"\\])*"'
+    r"|'(?:\\.|[^'\\])*'"
+    r"|`(?:\\.|[^`\\])*`"
+    r"|[A-Za-z_]\w*"
+    r"|\d+(?:\.\d+)?"
+    r"|\S"
+)
+
+_COMMENT_RE = {
+    ProgrammingLanguage.PYTHON: re.compile(r"#[^\n]*|\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?'''"),
+    ProgrammingLanguage.JAVASCRIPT: re.compile(r"//[^\n]*|/\*[\s\S]*?\*/"),
+    ProgrammingLanguage.JAVA: re.compile(r"//[^\n]*|/\*[\s\S]*?\*/"),
+    ProgrammingLanguage.CPP: re.compile(r"//[^\n]*|/\*[\s\S]*?\*/"),
+}
+
+_KEYWORDS = {
+    ProgrammingLanguage.PYTHON: {
+        "and", "as", "assert", "break", "class", "continue", "def", "del", "elif",
+        "else", "except", "False", "finally", "for", "from", "global", "if",
+        "import", "in", "is", "lambda", "None", "nonlocal", "not", "or", "pass",
+        "raise", "return", "True", "try", "while", "with", "yield",
+        "print", "input", "range", "len", "int", "str", "list", "dict", "set",
+    },
+    ProgrammingLanguage.JAVASCRIPT: {
+        "break", "case", "catch", "class", "const", "continue", "default",
+        "delete", "do", "else", "false", "finally", "for", "function", "if",
+        "in", "instanceof", "let", "new", "null", "of", "return", "switch",
+        "this", "throw", "true", "try", "typeof", "undefined", "var", "while",
+        "console", "log", "parseInt", "split", "map", "length",
+    },
+    ProgrammingLanguage.JAVA: {
+        "boolean", "break", "case", "catch", "char", "class", "continue",
+        "default", "do", "double", "else", "false", "final", "for", "if",
+        "import", "int", "long", "new", "null", "private", "public", "return",
+        "static", "String", "switch", "this", "throw", "true", "try", "void",
+        "while", "System", "out", "println", "Scanner",
+    },
+    ProgrammingLanguage.CPP: {
+        "auto", "bool", "break", "case", "char", "class", "const", "continue",
+        "default", "do", "double", "else", "false", "for", "if", "include",
+        "int", "long", "namespace", "return", "std", "struct", "switch",
+        "true", "using", "void", "while", "cin", "cout", "endl", "vector",
+    },
+}
+
+
+def normalize_tokens(code: str, language: ProgrammingLanguage) -> List[str]:
+    """
+    Strip comments and collapse identifiers, literals and numbers so that
+    renaming variables or rewording strings does not hide a copied solution.
+    """
+    comment_re = _COMMENT_RE.get(language)
+    if comment_re is not None:
+        code = comment_re.sub(" ", code)
+    keywords = _KEYWORDS.get(language, set())
+
+    tokens = []
+    for token in _TOKEN_RE.findall(code):
+        first = token[0]
+        if first in "\"'`":
+            tokens.append("S")
+        elif first.isdigit():
+            tokens.append("N")
+        elif first.isalpha() or first == "_":
+            tokens.append(token if token in keywords else "V")
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def shingles(tokens: List[str], size: int = SHINGLE_SIZE) -> Set[int]:
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode())} if tokens else set()
+    return {
+        zlib.crc32(" ".join(tokens[i:i + size]).encode())
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+def minhash_signature(shingle_set: Iterable[int]) -> Tuple[int, ...]:
+    signature = [_MAX_HASH] * NUM_PERMUTATIONS
+    for value in shingle_set:
+        for i, (a, b) in enumerate(_PERMUTATIONS):
+            h = ((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH
+            if h < signature[i]:
+                signature[i] = h
+    return tuple(signature)
+
+
+def pack_signature(signature: Tuple[int, ...]) -> bytes:
+    return _SIGNATURE_STRUCT.pack(*signature)
+
+
+def unpack_signature(packed: bytes) -> Tuple[int, ...]:
+    return _SIGNATURE_STRUCT.unpack(packed)
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return matches / NUM_PERMUTATIONS
+
+
+def _band_keys(signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+    return [
+        (band, hash(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+        for band in range(NUM_BANDS)
+    ]
+
+
+class QuestionIndex:
+    """LSH index over the submissions of a single question."""
+
+    def __init__(self):
+        self.signatures: Dict[int, Tuple[int, ...]] = {}
+        self.students: Dict[int, int] = {}
+        self.buckets: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        # created_at of the newest persisted signature loaded so far
+        self.synced_until: Optional[datetime] = None
+
+    def add(self, submission_id: int, student_id: int, signature: Tuple[int, ...]):
+        if submission_id in self.signatures:
+            self.remove(submission_id)
+        self.signatures[submission_id] = signature
+        self.students[submission_id] = student_id
+        for key in _band_keys(signature):
+            self.buckets[key].add(submission_id)
+
+    def remove(self, submission_id: int):
+        signature = self.signatures.pop(submission_id, None)
+        self.students.pop(submission_id, None)
+        if signature is None:
+            return
+        for key in _band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(submission_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def candidates(self, submission_id: int) -> Set[int]:
+        signature = self.signatures.get(submission_id)
+        if signature is None:
+            return set()
+        found = set()
+        for key in _band_keys(signature):
+            found |= self.buckets.get(key, set())
+        found.discard(submission_id)
+        return found
+
+    def near_duplicates(
+        self,
+        submission_id: int,
+        threshold: float,
+        limit: int
+    ) -> List[Tuple[int, int, float]]:
+        signature = self.signatures.get(submission_id)
+        if signature is None:
+            return []
+        student_id = self.students[submission_id]
+        results = []
+        for other_id in self.candidates(submission_id):
+            # A student resubmitting their own code is not a copy
+            if self.students[other_id] == student_id:
+                continue
+            score = estimate_similarity(signature, self.signatures[other_id])
+            if score >= threshold:
+                results.append((other_id, self.students[other_id], score))
+        results.sort(key=lambda r: r[2], reverse=True)
+        return results[:limit]
+
+    def clusters(self, threshold: float) -> List[List[int]]:
+        parent = {sid: sid for sid in self.signatures}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        # Each bucket is checked against its first member only, which keeps
+        # clustering linear in the number of bucket entries even when a
+        # large share of the class starts from the same template.
+        for members in self.buckets.values():
+            if len(members) < 2:
+                continue
+            ordered = sorted(members)
+            root = ordered[0]
+            root_sig = self.signatures[root]
+            for other in ordered[1:]:
+                ra, rb = find(root), find(other)
+                # Already joined through another bucket; skip the comparison
+                if ra == rb:
+                    continue
+                if estimate_similarity(root_sig, self.signatures[other]) >= threshold:
+                    parent[rb] = ra
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for sid in self.signatures:
+            groups[find(sid)].append(sid)
+
+        result = []
+        for members in groups.values():
+            if len({self.students[sid] for sid in members}) < 2:
+                continue
+            result.append(sorted(members))
+        result.sort(key=len, reverse=True)
+        return result
+
+
+class SimilarityIndex:
+    """
+    Process-wide registry of per-question LSH indexes.
+
+    Signatures are computed once, when a verdict lands, and persisted in
+    ``submission_signatures``. Each worker loads them per question and then
+    catches up on rows written since, re-reading a ``SYNC_OVERLAP`` window so
+    that rows committed late or replayed late by a replica are not skipped.
+    Rows already indexed are recognised by submission id.
+    """
+
+    def __init__(self):
+        self._questions: Dict[int, QuestionIndex] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, question_id: int) -> QuestionIndex:
+        index = self._questions.get(question_id)
+        if index is None:
+            index = self._questions.setdefault(question_id, QuestionIndex())
+        return index
+
+    def record_submission(self, db, submission) -> bool:
+        """
+        Compute, persist and index the signature of a judged submission.
+        Returns False when the code is not available (archive unreadable).
+        """
+        from app.models.submission_signature import SubmissionSignature
+        from app.services.archival import ArchiveUnavailableError, load_archived_fields
+
+        try:
+            code = load_archived_fields(submission)["code"]
+        except ArchiveUnavailableError:
+            return False
+        signature = minhash_signature(shingles(normalize_tokens(code, submission.language)))
+        db.merge(SubmissionSignature(
+            submission_id=submission.id,
+            question_id=submission.question_id,
+            student_id=submission.student_id,
+            signature=pack_signature(signature),
+            created_at=datetime.utcnow()
+        ))
+        db.commit()
+        with self._lock:
+            self._get(submission.question_id).add(submission.id, submission.student_id, signature)
+        return True
+
+    def remove_question(self, question_id: int):
+        with self._lock:
+            self._questions.pop(question_id, None)
+
+    def sync(self, db, question_id: int):
+        """Load persisted signatures for the question not yet indexed by this process."""
+        from app.models.submission_signature import SubmissionSignature
+
+        with self._lock:
+            synced_until = self._get(question_id).synced_until
+
+        query = db.query(
+            SubmissionSignature.submission_id,
+            SubmissionSignature.student_id,
+            SubmissionSignature.signature,
+            SubmissionSignature.created_at
+        ).filter(SubmissionSignature.question_id == question_id)
+        if synced_until is not None:
+            query = query.filter(SubmissionSignature.created_at >= synced_until - SYNC_OVERLAP)
+
+        for submission_id, student_id, packed, created_at in query.yield_per(1000):
+            with self._lock:
+                index = self._get(question_id)
+                if submission_id not in index.signatures:
+                    index.add(submission_id, student_id, unpack_signature(packed))
+                if index.synced_until is None or created_at > index.synced_until:
+                    index.synced_until = created_at
+
+    def near_duplicates(
+        self,
+        question_id: int,
+        submission_id: int,
+        threshold: float,
+        limit: int = 20
+    ) -> List[Tuple[int, int, float]]:
+        with self._lock:
+            return self._get(question_id).near_duplicates(submission_id, threshold, limit)
+
+    def clusters(self, question_id: int, threshold: float) -> List[List[int]]:
+        with self._lock:
+            return self._get(question_id).clusters(threshold)
+
+    def student_of(self, question_id: int, submission_id: int) -> Optional[int]:
+        with self._lock:
+            return self._get(question_id).students.get(submission_id)
+
+
+similarity_index = SimilarityIndex()
+
+
+def backfill_signatures(db, batch_size: int = 500) -> int:
+    """Persist signatures for judged submissions that do not have one yet."""
+    from app.models.submission import Submission, SubmissionStatus
+    from app.models.submission_signature import SubmissionSignature
+
+    done = 0
+    last_id = 0
+    while True:
+        batch = db.query(Submission).outerjoin(
+            SubmissionSignature, SubmissionSignature.submission_id == Submission.id
+        ).filter(
+            SubmissionSignature.submission_id.is_(None),
+            Submission.id > last_id,
+            Submission.status.notin_([SubmissionStatus.PENDING, SubmissionStatus.RUNNING])
+        ).order_by(Submission.id).limit(batch_size).all()
+        if not batch:
+            return done
+        for submission in batch:
+            if similarity_index.record_submission(db, submission):
+                done += 1
+        last_id = batch[-1].id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill submission similarity signatures")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.models import user, question  # noqa: F401 - register mappers
+
+    db = SessionLocal()
+    try:
+        print(f"Stored {backfill_signatures(db, args.batch_size)} signatures")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,89 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from app.services.code_executor import CodeExecutor
+from app.services.test_stats import QuestionTestStats
 from app.models.submission import ProgrammingLanguage, SubmissionStatus
 
+# (status, error message) of a failed test case, or None if it passed
+TestFailure = Optional[Tuple[SubmissionStatus, str]]
+
 class TestRunner:
     def __init__(self, time_limit: int = 2, memory_limit: int = 256):
         self.executor = CodeExecutor(time_limit, memory_limit)
-    
+
+    def _run_case(
+        self,
+        code: str,
+        language: ProgrammingLanguage,
+        index: int,
+        test_case: Dict
+    ) -> Tuple[float, TestFailure]:
+        """Run one test case and return (time, failure)"""
+        expected_output = test_case["output"].strip()
+
+        stdout, stderr, exec_time, success = self.executor.execute(
+            code, language, test_case["input"]
+        )
+
+        if not success:
+            if "Time Limit Exceeded" in stderr:
+                return exec_time, (
+                    SubmissionStatus.TIME_LIMIT_EXCEEDED,
+                    f"Time limit exceeded on test case {index + 1}"
+                )
+            return exec_time, (
+                SubmissionStatus.RUNTIME_ERROR,
+                f"Runtime error on test case {index + 1}: {stderr}"
+            )
+
+        # Compare output
+        if stdout.strip() != expected_output:
+            return exec_time, (
+                SubmissionStatus.WRONG_ANSWER,
+                f"Wrong answer on test case {index + 1}"
+            )
+        return exec_time, None
+
     def run_tests(
         self,
         code: str,
         language: ProgrammingLanguage,
-        test_cases: List[Dict]
+        test_cases: List[Dict],
+        stats: Optional[QuestionTestStats] = None
     ) -> Tuple[SubmissionStatus, int, int, float, str]:
         """
         Run all test cases and return (status, passed, total, time, error_msg)
+
+        With ``stats``, tests run in the order most likely to fail early and
+        each outcome is recorded. Judging stops at the first failure in that
+        order, which is reported by its stored test number. ``passed`` is the
+        number of tests that passed before judging stopped.
         """
         total_tests = len(test_cases)
-        passed_tests = 0
         total_time = 0.0
-        error_message = ""
-        
-        for i, test_case in enumerate(test_cases):
-            test_input = test_case["input"]
-            expected_output = test_case["output"].strip()
-            
-            stdout, stderr, exec_time, success = self.executor.execute(
-                code, language, test_input
-            )
-            
+        passed_tests = 0
+
+        order = stats.order() if stats is not None else range(total_tests)
+        for i in order:
+            exec_time, failure = self._run_case(code, language, i, test_cases[i])
             total_time += exec_time
-            
-            if not success:
-                if "Time Limit Exceeded" in stderr:
-                    return (
-                        SubmissionStatus.TIME_LIMIT_EXCEEDED,
-                        passed_tests,
-                        total_tests,
-                        total_time,
-                        f"Time limit exceeded on test case {i + 1}"
-                    )
-                else:
-                    return (
-                        SubmissionStatus.RUNTIME_ERROR,
-                        passed_tests,
-                        total_tests,
-                        total_time,
-                        f"Runtime error on test case {i + 1}: {stderr}"
-                    )
-            
-            # Compare output
-            actual_output = stdout.strip()
-            if actual_output == expected_output:
-                passed_tests += 1
-            else:
+            if stats is not None:
+                stats.record(i, exec_time, failure is None)
+
+            if failure is not None:
+                status, error_message = failure
                 return (
-                    SubmissionStatus.WRONG_ANSWER,
+                    status,
                     passed_tests,
                     total_tests,
                     total_time,
-                    f"Wrong answer on test case {i + 1}"
+                    error_message
                 )
-        
+            passed_tests += 1
+
         return (
             SubmissionStatus.ACCEPTED,
             passed_tests,
             total_tests,
             total_time,
             "All test cases passed"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+# Smoothing priors: an unseen test is assumed to fail half the time and to
+# cost PRIOR_COST seconds, so new tests keep their stored order until data
+# accumulates.
+PRIOR_COST = 0.1
+
+
+class QuestionTestStats:
+    """
+    Per-test failure counts and CPU time for one version of a question.
+
+    Ordering tests by failure probability per second of runtime minimises
+    the expected time until the first failure, so wrong submissions are
+    rejected after as little work as possible.
+    """
+
+    def __init__(self, num_tests: int):
+        self.runs = [0] * num_tests
+        self.failures = [0] * num_tests
+        self.time = [0.0] * num_tests
+        self._lock = threading.Lock()
+
+    def _priority(self, i: int) -> float:
+        fail_rate = (self.failures[i] + 1) / (self.runs[i] + 2)
+        cost = (self.time[i] + PRIOR_COST) / (self.runs[i] + 1)
+        return fail_rate / cost
+
+    def order(self) -> List[int]:
+        with self._lock:
+            priorities = [self._priority(i) for i in range(len(self.runs))]
+        # sorted() is stable, so ties keep the stored order
+        return sorted(range(len(priorities)), key=lambda i: -priorities[i])
+
+    def record(self, index: int, exec_time: float, passed: bool):
+        with self._lock:
+            self.runs[index] += 1
+            self.time[index] += exec_time
+            if not passed:
+                self.failures[index] += 1
+
+
+class TestStatsRegistry:
+    """LRU map of (question id, version) to its test statistics."""
+
+    def __init__(self, max_questions: int = 4096):
+        self.max_questions = max_questions
+        self._stats: "OrderedDict[Tuple[int, int], QuestionTestStats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, question_id: int, version: int, num_tests: int) -> QuestionTestStats:
+        # Editing a question bumps its version, which starts fresh statistics
+        key = (question_id, version)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None or len(stats.runs) != num_tests:
+                stats = QuestionTestStats(num_tests)
+                self._stats[key] = stats
+            self._stats.move_to_end(key)
+            while len(self._stats) > self.max_questions:
+                self._stats.popitem(last=False)
+            return stats
+
+
+test_stats = TestStatsRegistry()
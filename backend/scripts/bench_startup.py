@@ -0,0 +1,67 @@
+"""
+Startup-time benchmark for API workers.
+
+Starts fresh interpreters that import ``app.main`` and answer one request
+to ``/health`` in-process, and reports how long a new worker takes to
+become ready. Exits non-zero if the median time to ready (measured inside
+the child, from the start of ``import app.main`` to the first response)
+exceeds the budget. Interpreter startup is reported in the wall time but
+not budgeted.
+
+    cd backend && python scripts/bench_startup.py --runs 10 --budget 1.0
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child; prints import and first-request times in seconds
+_CHILD = """
+import time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(app)
+assert client.get("/health").status_code == 200
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+def run_once():
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    wall = time.perf_counter() - start
+    import_time, ready_time = map(float, output.split())
+    return import_time, ready_time, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API worker startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="max median seconds from importing app.main to the first /health response")
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    imports, readies, walls = zip(*results)
+    print(f"import app.main   median {statistics.median(imports):.3f}s  max {max(imports):.3f}s")
+    print(f"ready to serve    median {statistics.median(readies):.3f}s  max {max(readies):.3f}s")
+    print(f"process wall time median {statistics.median(walls):.3f}s  max {max(walls):.3f}s")
+
+    if statistics.median(readies) > args.budget:
+        print(f"FAIL: median time to ready exceeds {args.budget:.2f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
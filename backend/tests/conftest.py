@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Keep tests off the configured Postgres database; must run before app imports
+os.environ["DATABASE_URL"] = "sqlite://"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,75 @@
+import asyncio
+from app.models.submission import ProgrammingLanguage, SubmissionStatus
+from app.services.ai_feedback import (
+    FeedbackJob, FeedbackPipeline, FeedbackProviderError, StubFeedbackProvider
+)
+
+
+class FlakyProvider(StubFeedbackProvider):
+    """Stub that rate-limits the first completion for one submission."""
+
+    def __init__(self, fail_submission_id):
+        super().__init__()
+        self.fail_submission_id = fail_submission_id
+        self.jobs = []
+
+    async def generate(self, jobs):
+        self.jobs.append([job.submission_id for job in jobs])
+        results = await super().generate(jobs)
+        return [
+            FeedbackProviderError("429", retryable=True)
+            if job.submission_id == self.fail_submission_id and job.attempts == 0 else text
+            for job, text in zip(jobs, results)
+        ]
+
+
+def make_job(submission_id, code, status=SubmissionStatus.WRONG_ANSWER):
+    return FeedbackJob(
+        submission_id=submission_id,
+        question_id=1,
+        question_title="Sum",
+        question_description="Add the numbers",
+        language=ProgrammingLanguage.PYTHON,
+        code=code,
+        status=status,
+        error_message="Wrong answer on test case 3"
+    )
+
+
+async def wait_for_saved(saved, ids):
+    while not ids <= set(saved):
+        await asyncio.sleep(0.01)
+
+
+def test_dedup_cache_and_partial_failure():
+    saved = {}
+    provider = FlakyProvider(fail_submission_id=3)
+    pipeline = FeedbackPipeline(provider, batch_wait=0.05, save=saved.update, retry_delay=0)
+
+    async def scenario():
+        pipeline.start()
+        try:
+            # 1 and 2 differ only in identifiers, so they share one completion
+            for job in [
+                make_job(1, "a = int(input())\nprint(a)"),
+                make_job(2, "b = int(input())\nprint(b)"),
+                make_job(3, "print(1 / 0)", SubmissionStatus.RUNTIME_ERROR),
+                make_job(4, "while True: pass", SubmissionStatus.TIME_LIMIT_EXCEEDED),
+            ]:
+                pipeline.enqueue(job)
+
+            # The rate-limited job is requeued and succeeds on its retry,
+            # without failing the rest of its batch
+            await asyncio.wait_for(wait_for_saved(saved, {1, 2, 3, 4}), 2)
+            assert provider.jobs == [[1, 3, 4], [3]]
+            assert saved[1] == saved[2]
+
+            # Same question, error and normalized code: served from the cache
+            pipeline.enqueue(make_job(5, "c = int(input())\nprint(c)"))
+            await asyncio.wait_for(wait_for_saved(saved, {5}), 2)
+            assert provider.calls == 2
+            assert saved[5] == saved[1]
+        finally:
+            await pipeline.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+from datetime import datetime
+import pytest
+from app.database import Base, SessionLocal, engine
+from app.models import user, question  # noqa: F401 - register mappers
+from app.models.submission import Submission, SubmissionStatus, ProgrammingLanguage
+from app.services.archival import ArchiveStore, ArchiveUnavailableError, archive_submissions
+
+
+def test_bodies_are_packed_per_month_and_batch(tmp_path):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    submissions = []
+    for i in range(6):
+        submissions.append(Submission(
+            code=f"print({i})",
+            language=ProgrammingLanguage.PYTHON,
+            status=SubmissionStatus.WRONG_ANSWER,
+            question_id=1,
+            student_id=1,
+            submitted_at=datetime(2024, 1 + i % 2, 5)
+        ))
+    db.add_all(submissions)
+    db.commit()
+    ids = [s.id for s in submissions]
+
+    store = ArchiveStore(str(tmp_path))
+    assert archive_submissions(db, datetime(2025, 1, 1), batch_size=6, store=store) == 6
+    # One pack per month of the batch
+    assert sorted(str(p.relative_to(tmp_path)) for p in tmp_path.glob("*/*.json.gz")) == [
+        f"2024-01/{ids[0]}-{ids[4]}.json.gz",
+        f"2024-02/{ids[1]}-{ids[5]}.json.gz",
+    ]
+
+    for s in submissions:
+        db.refresh(s)
+    assert [store.get(s.archive_key)["code"] for s in submissions] == [f"print({i})" for i in range(6)]
+    assert all(s.code == "" for s in submissions)
+
+    (tmp_path / "2024-01" / f"{ids[0]}-{ids[4]}.json.gz").unlink()
+    store = ArchiveStore(str(tmp_path))
+    with pytest.raises(ArchiveUnavailableError):
+        store.get(submissions[0].archive_key)
+    db.close()
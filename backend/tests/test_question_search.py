@@ -0,0 +1,37 @@
+from app.database import Base, SessionLocal, engine
+from app.models import user  # noqa: F401 - register mappers
+from app.models.question import Question, DifficultyLevel
+from app.services.question_search import InvertedIndexBackend, SearchFilters
+
+
+def search_ids(backend, db, text):
+    return [q.id for q in backend.search(db, text, SearchFilters(), 0, 10)]
+
+
+def test_inverted_index_sees_writes_from_other_workers():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    writer, reader = InvertedIndexBackend(), InvertedIndexBackend(refresh_interval=0)
+
+    question = Question(
+        title="Knapsack", description="Pack items", difficulty=DifficultyLevel.MEDIUM,
+        teacher_id=1, test_cases=[]
+    )
+    db.add(question)
+    db.commit()
+    writer.index(question)
+    assert search_ids(reader, db, "knapsack") == [question.id]
+
+    # Edited through the other worker
+    question.title = "Coin change"
+    question.version = Question.version + 1
+    db.commit()
+    db.refresh(question)
+    writer.index(question)
+    assert search_ids(reader, db, "knapsack") == []
+    assert search_ids(reader, db, "coin") == [question.id]
+
+    db.delete(question)
+    db.commit()
+    assert search_ids(reader, db, "coin") == []
+    db.close()
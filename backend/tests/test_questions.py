@@ -0,0 +1,47 @@
+from sqlalchemy import event
+from app.database import Base, SessionLocal, engine
+from app.models.user import User, UserRole
+from app.models.question import Question, DifficultyLevel
+from app.models.submission import Submission, SubmissionStatus, ProgrammingLanguage
+from app.models.submission_signature import SubmissionSignature
+from app.api.v1.questions import delete_question
+from app.services.similarity import similarity_index
+
+
+def enable_foreign_keys(dbapi_connection, _):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def test_delete_question_with_signatures():
+    event.listen(engine, "connect", enable_foreign_keys)
+    engine.dispose()  # reconnect so the pragma applies
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        teacher = User(email="del@x.com", username="del", hashed_password="x", role=UserRole.TEACHER)
+        db.add(teacher)
+        db.commit()
+        question = Question(
+            title="Echo", description="Echo input", difficulty=DifficultyLevel.EASY,
+            teacher_id=teacher.id, test_cases=[]
+        )
+        db.add(question)
+        db.commit()
+        submission = Submission(
+            code="print(input())", language=ProgrammingLanguage.PYTHON,
+            status=SubmissionStatus.WRONG_ANSWER, question_id=question.id, student_id=teacher.id
+        )
+        db.add(submission)
+        db.commit()
+        assert similarity_index.record_submission(db, submission)
+
+        delete_question(question.id, db, teacher)
+
+        assert db.query(Question).filter(Question.id == question.id).first() is None
+        assert db.query(SubmissionSignature).filter(
+            SubmissionSignature.question_id == question.id
+        ).count() == 0
+        db.close()
+    finally:
+        event.remove(engine, "connect", enable_foreign_keys)
+        engine.dispose()
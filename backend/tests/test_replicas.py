@@ -0,0 +1,34 @@
+import threading
+from app.database import Replica, ReplicaRouter
+
+
+class StalledReplica(Replica):
+    """Replica whose lag check blocks until released."""
+
+    def __init__(self):
+        super().__init__("sqlite://")
+        self.checking = threading.Event()
+        self.release = threading.Event()
+
+    def lag(self) -> float:
+        self.checking.set()
+        self.release.wait(5)
+        return 0.0
+
+
+def test_slow_health_check_does_not_block_other_reads():
+    router = ReplicaRouter([], max_lag=5, check_interval=2)
+    replica = StalledReplica()
+    router.replicas = [replica]
+
+    checker = threading.Thread(target=router._is_usable, args=(replica,))
+    checker.start()
+    assert replica.checking.wait(5)
+
+    # While the check hangs, other requests use the last known state
+    assert router._is_usable(replica) is False
+    assert not replica.release.is_set()
+
+    replica.release.set()
+    checker.join(5)
+    assert router._is_usable(replica) is True
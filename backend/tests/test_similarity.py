@@ -0,0 +1,42 @@
+from app.database import Base, SessionLocal, engine
+from app.models import user, question  # noqa: F401 - register mappers
+from app.models.submission import Submission, SubmissionStatus, ProgrammingLanguage
+from app.models.submission_signature import SubmissionSignature  # noqa: F401
+from app.services.similarity import SimilarityIndex
+
+CODE = "n = int(input())\ntotal = 0\nfor i in range(n):\n    total += int(input())\nprint(total)\n"
+
+
+def make_submission(db, student_id, code=CODE):
+    submission = Submission(
+        code=code,
+        language=ProgrammingLanguage.PYTHON,
+        status=SubmissionStatus.PENDING,
+        question_id=1,
+        student_id=student_id
+    )
+    db.add(submission)
+    db.commit()
+    return submission
+
+
+def test_out_of_order_verdicts_are_indexed_by_other_workers():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    judge, reader = SimilarityIndex(), SimilarityIndex()
+
+    earlier = make_submission(db, student_id=1)
+    later = make_submission(db, student_id=2, code=CODE.replace("total", "s"))
+
+    # The later submission finishes first and the reader catches up on it
+    later.status = SubmissionStatus.WRONG_ANSWER
+    judge.record_submission(db, later)
+    reader.sync(db, 1)
+    assert reader.near_duplicates(1, later.id, 0.8) == []
+
+    earlier.status = SubmissionStatus.WRONG_ANSWER
+    judge.record_submission(db, earlier)
+    reader.sync(db, 1)
+
+    assert [m[0] for m in reader.near_duplicates(1, later.id, 0.8)] == [earlier.id]
+    db.close()
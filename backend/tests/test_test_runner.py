@@ -0,0 +1,80 @@
+from app.models.submission import ProgrammingLanguage, SubmissionStatus
+from app.services import test_runner
+from app.services.test_stats import QuestionTestStats
+
+TEST_CASES = [
+    {"input": "1", "output": "1"},
+    {"input": "2", "output": "2"},
+    {"input": "3", "output": "3"},
+]
+
+
+class FakeExecutor:
+    """Echoes the input, except for inputs listed in ``wrong``."""
+
+    def __init__(self, wrong):
+        self.wrong = set(wrong)
+        self.runs = []
+
+    def execute(self, code, language, test_input):
+        self.runs.append(test_input)
+        output = "x" if test_input in self.wrong else test_input
+        return output, "", 0.01, True
+
+
+def run(wrong, stats=None, test_cases=TEST_CASES):
+    runner = test_runner.TestRunner()
+    runner.executor = FakeExecutor(wrong)
+    result = runner.run_tests("", ProgrammingLanguage.PYTHON, test_cases, stats=stats)
+    return result, runner.executor.runs
+
+
+def failing_stats(num_tests, index):
+    stats = QuestionTestStats(num_tests)
+    for _ in range(10):
+        stats.record(index, 0.01, False)
+    return stats
+
+
+def test_failure_is_reported_by_stored_number():
+    # Test 3 has failed before, so it is tried first
+    stats = failing_stats(len(TEST_CASES), 2)
+    assert stats.order()[0] == 2
+
+    (status, passed, total, _, message), runs = run(wrong={"1", "3"}, stats=stats)
+
+    assert runs == ["3"]
+    assert (status, passed, total) == (SubmissionStatus.WRONG_ANSWER, 0, 3)
+    assert message == "Wrong answer on test case 3"
+
+
+def test_late_failing_test_is_reached_sooner():
+    test_cases = [{"input": str(i), "output": str(i)} for i in range(1, 11)]
+
+    _, baseline_runs = run(wrong={"10"}, test_cases=test_cases)
+    (status, _, _, _, message), runs = run(
+        wrong={"10"}, stats=failing_stats(10, 9), test_cases=test_cases
+    )
+
+    assert len(baseline_runs) == 10
+    assert runs == ["10"]
+    assert status == SubmissionStatus.WRONG_ANSWER
+    assert message == "Wrong answer on test case 10"
+
+
+def test_passed_counts_tests_passed_before_stopping():
+    # Test 2 has failed before, so the order is 2, 1, 3; judging stops at
+    # test 1 after test 2 passed and test 3 never runs
+    (status, passed, _, _, message), runs = run(wrong={"1"}, stats=failing_stats(len(TEST_CASES), 1))
+
+    assert runs == ["2", "1"]
+    assert (status, passed) == (SubmissionStatus.WRONG_ANSWER, 1)
+    assert message == "Wrong answer on test case 1"
+
+
+def test_accepted_runs_every_test_once():
+    stats = QuestionTestStats(len(TEST_CASES))
+    (status, passed, _, _, _), runs = run(wrong=set(), stats=stats)
+
+    assert (status, passed) == (SubmissionStatus.ACCEPTED, 3)
+    assert sorted(runs) == ["1", "2", "3"]